@@ -1,19 +1,56 @@
+import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, update, insert, bindparam
 from models.item import Item as ItemModel
 from schemas.item import Item as ItemSchema
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# 一覧取得で使うカラムの組。ORMオブジェクトを経由せずカラムを直接SELECTする
+# ことで、行ごとのORMインスタンス生成コストを省く
+_ITEM_COLUMNS = (
+    ItemModel.item_id,
+    ItemModel.task_name,
+    ItemModel.user_id,
+    ItemModel.expire_date,
+    ItemModel.finished_date,
+)
+
+# SELECT文はモジュール読み込み時に1回だけ構築し、実行時はbindparamに
+# 値を渡すだけにする（リクエストごとの文構築コストを省く）
+_SELECT_ALL_ITEMS = select(*_ITEM_COLUMNS)
+_SELECT_ITEMS_BY_USER = select(*_ITEM_COLUMNS).where(
+    ItemModel.user_id == bindparam("user_id")
+)
+_SELECT_ITEM_BY_ID = select(ItemModel).where(
+    ItemModel.item_id == bindparam("item_id")
+)
+
+def _item_from_orm(item: ItemModel) -> ItemSchema:
+    """
+    ORMモデルをバリデーションなしでPydanticモデルに変換するヘルパー関数
+
+    DBから取得したデータは書き込み時に検証済みのため、
+    model_validateの代わりにmodel_constructを使って変換コストを削減する。
+    """
+    return ItemSchema.model_construct(
+        item_id=item.item_id,
+        task_name=item.task_name,
+        user_id=item.user_id,
+        expire_date=item.expire_date,
+        finished_date=item.finished_date,
+    )
+
 async def get_item(session: AsyncSession) -> list[ItemSchema]:
     """
     全タスクを取得する関数
     """
     try:
-        result = await session.execute(select(ItemModel))
-        items = result.scalars().all()
-        return [ItemSchema.model_validate(item) for item in items]
-    except Exception as e:
-        print(f"Error occurred while fetching items: {e}")
+        result = await session.execute(_SELECT_ALL_ITEMS)
+        return [ItemSchema.model_construct(**row) for row in result.mappings()]
+    except Exception:
+        logger.exception("Error occurred while fetching items")
         return []
 
 async def get_item_by_user_id(session: AsyncSession, user_id: int) -> list[ItemSchema]:
@@ -21,13 +58,27 @@ async def get_item_by_user_id(session: AsyncSession, user_id: int) -> list[ItemS
     ユーザーIDに紐づく全タスクを取得する関数
     """
     try:
-        result = await session.execute(select(ItemModel).where(ItemModel.user_id == user_id))
-        items = result.scalars().all()
-        return [ItemSchema.model_validate(item) for item in items]
-    except Exception as e:
-        print(f"Error occurred while fetching items: {e}")
+        # カラムを直接SELECTするためリレーションのロード自体が発生しない
+        result = await session.execute(_SELECT_ITEMS_BY_USER, {"user_id": user_id})
+        return [ItemSchema.model_construct(**row) for row in result.mappings()]
+    except Exception:
+        logger.exception("Error occurred while fetching items")
         return []
     
+async def stream_items(session: AsyncSession):
+    """
+    全タスクを1件ずつ辞書として返す非同期ジェネレータ
+
+    全件をリストに載せてから返すget_itemと異なり、結果セットを
+    ストリーミングで読み出すため、件数が多くてもメモリ使用量が一定になる。
+
+    Yields:
+        dict: カラム名→値の辞書（1タスク分）
+    """
+    result = await session.stream(_SELECT_ALL_ITEMS)
+    async for row in result.mappings():
+        yield dict(row)
+
 async def get_item_by_id(session: AsyncSession, item_id: int) -> ItemSchema | None:
     """
     タスクIDでタスク情報を取得する関数
@@ -42,13 +93,11 @@ async def get_item_by_id(session: AsyncSession, item_id: int) -> ItemSchema | No
             - タスクが存在しない場合: None
     """
     try:
-        result = await session.execute(
-            select(ItemModel).where(ItemModel.item_id == item_id)
-        )
+        result = await session.execute(_SELECT_ITEM_BY_ID, {"item_id": item_id})
         item = result.scalar_one_or_none()
-        return ItemSchema.model_validate(item) if item else None
-    except Exception as e:
-        print(f"Error occurred while fetching item by id: {e}")
+        return _item_from_orm(item) if item else None
+    except Exception:
+        logger.exception("Error occurred while fetching item by id")
         return None
 
 async def delete_item(session: AsyncSession, item_id: int) -> bool:
@@ -63,18 +112,16 @@ async def delete_item(session: AsyncSession, item_id: int) -> bool:
         bool: 削除成功時True、失敗時False
     """
     try:
+        # SELECTで取得してからdeleteするとDBへの往復が2回になるため、
+        # DELETE文を1回発行してrowcountで削除の成否を判定する
         result = await session.execute(
-            select(ItemModel).where(ItemModel.item_id == item_id)
+            delete(ItemModel).where(ItemModel.item_id == item_id)
         )
-        item = result.scalar_one_or_none()
-        if item:
-            await session.delete(item)
-            await session.commit()
-            return True
-        return False
-    except Exception as e:
+        await session.commit()
+        return result.rowcount > 0
+    except Exception:
         await session.rollback()
-        print(f"Error occurred while deleting item: {e}")
+        logger.exception("Error occurred while deleting item")
         return False
 
 async def create_item(session: AsyncSession, item: ItemSchema) -> ItemSchema | None:
@@ -93,14 +140,50 @@ async def create_item(session: AsyncSession, item: ItemSchema) -> ItemSchema | N
         new_item = ItemModel(**item.model_dump(exclude_unset=True))
         session.add(new_item)
         await session.commit()
-        await session.refresh(new_item)
+        # expire_on_commit=Falseのためcommit後も属性は有効で、
+        # 自動採番のitem_idもflush時に反映済み（refresh不要）
         # SQLAlchemyモデルをPydanticモデルに変換して返す
-        return ItemSchema.model_validate(new_item)
-    except Exception as e:
+        return _item_from_orm(new_item)
+    except Exception:
         await session.rollback()
-        print(f"Error occurred while creating item: {e}")
+        logger.exception("Error occurred while creating item")
         return None
 
+async def create_items(session: AsyncSession, items: list[ItemSchema]) -> int:
+    """
+    複数タスクを一括登録する関数
+
+    タスクごとにINSERTとcommitを繰り返す代わりに、複数行をまとめた
+    INSERT文を1回発行して1トランザクションで登録する。
+
+    Args:
+        session (AsyncSession): 非同期データベースセッション
+        items (list[ItemSchema]): 登録するタスクのリスト
+
+    Returns:
+        int: 登録されたタスク数（失敗時は0、全件ロールバックされる）
+    """
+    if not items:
+        return 0
+    try:
+        # item_idは自動採番のため除外し、全行同じキー構成の辞書を作る
+        rows = [
+            {
+                "task_name": item.task_name,
+                "user_id": item.user_id,
+                "expire_date": item.expire_date,
+                "finished_date": item.finished_date,
+            }
+            for item in items
+        ]
+        result = await session.execute(insert(ItemModel).values(rows))
+        await session.commit()
+        return result.rowcount
+    except Exception:
+        await session.rollback()
+        logger.exception("Error occurred while creating items")
+        return 0
+
 async def update_item(session: AsyncSession, item_id: int, item_data: ItemSchema) -> ItemSchema | None:
     """
     タスクを更新する関数
@@ -116,25 +199,22 @@ async def update_item(session: AsyncSession, item_id: int, item_data: ItemSchema
             - タスクが存在しない場合: None
     """
     try:
-        result = await session.execute(
-            select(ItemModel).where(ItemModel.item_id == item_id)
+        # UPDATE ... RETURNINGで更新と更新後の行取得を1文にまとめる
+        # （SELECT→setattr→commit→refreshの4往復を1往復に削減）
+        stmt = (
+            update(ItemModel)
+            .where(ItemModel.item_id == item_id)
+            .values(**item_data.model_dump(exclude_unset=True))
+            .returning(ItemModel)
         )
+        result = await session.execute(stmt)
         item = result.scalar_one_or_none()
-        if not item:
-            return None
-            
-        # Pydanticの自動変換を活用してシンプルに更新
-        update_data = item_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(item, key, value)
-            
         await session.commit()
-        await session.refresh(item)
-        return ItemSchema.model_validate(item)
-        
-    except Exception as e:
+        return _item_from_orm(item) if item else None
+
+    except Exception:
         await session.rollback()
-        print(f"Error occurred while updating item: {e}")
+        logger.exception("Error occurred while updating item")
         return None
 
 async def update_finished_date(session: AsyncSession, item_id: int, finished_date: datetime | None) -> ItemSchema | None:
@@ -152,19 +232,19 @@ async def update_finished_date(session: AsyncSession, item_id: int, finished_dat
             - タスクが存在しない場合: None
     """
     try:
-        result = await session.execute(
-            select(ItemModel).where(ItemModel.item_id == item_id)
+        # UPDATE ... RETURNINGで更新と更新後の行取得を1文にまとめる
+        stmt = (
+            update(ItemModel)
+            .where(ItemModel.item_id == item_id)
+            .values(finished_date=finished_date)
+            .returning(ItemModel)
         )
+        result = await session.execute(stmt)
         item = result.scalar_one_or_none()
-        if not item:
-            return None
-            
-        item.finished_date = finished_date
         await session.commit()
-        await session.refresh(item)
-        return ItemSchema.model_validate(item)
-        
-    except Exception as e:
+        return _item_from_orm(item) if item else None
+
+    except Exception:
         await session.rollback()
-        print(f"Error occurred while updating finish date: {e}")
+        logger.exception("Error occurred while updating finish date")
         return None
\ No newline at end of file
@@ -1,7 +1,39 @@
-from sqlalchemy import select
+import logging
+from sqlalchemy import select, delete, update, bindparam, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User as UserModel  # SQLAlchemyのORMモデル
 from schemas.user import User as UserSchema  # PydanticのAPIスキーマ
+from security.password import hash_password, is_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+# 一覧取得で使うカラムの組。ORMオブジェクトを経由せずカラムを直接SELECTする
+# ことで、行ごとのORMインスタンス生成コストを省く
+_USER_COLUMNS = (
+    UserModel.user_id,
+    UserModel.name,
+    UserModel.password,
+)
+
+# SELECT文はモジュール読み込み時に1回だけ構築し、実行時はbindparamに
+# 値を渡すだけにする（リクエストごとの文構築コストを省く）
+_SELECT_ALL_USERS = select(*_USER_COLUMNS)
+_SELECT_USER_BY_ID = select(UserModel).where(
+    UserModel.user_id == bindparam("user_id")
+)
+
+def _user_from_orm(user: UserModel) -> UserSchema:
+    """
+    ORMモデルをバリデーションなしでPydanticモデルに変換するヘルパー関数
+
+    DBから取得したデータは書き込み時に検証済みのため、
+    model_validateの代わりにmodel_constructを使って変換コストを削減する。
+    """
+    return UserSchema.model_construct(
+        user_id=user.user_id,
+        name=user.name,
+        password=user.password,
+    )
 
 async def get_user_by_id_and_password(session: AsyncSession, user_id: str, password: str) -> UserSchema | None:
     """
@@ -13,16 +45,16 @@ async def get_user_by_id_and_password(session: AsyncSession, user_id: str, passw
             - データベースとの接続を管理
         user_id (str): 検索対象のユーザーID
         password (str): 照合するパスワード（平文）
-            ※実際のアプリではハッシュ化されたパスワードと比較すべき
+            ※DBにはbcryptハッシュが保存されており、アプリ側で照合する
 
     Returns:
-        UserSchema | None: 
+        UserSchema | None:
             - 認証成功時: ユーザー情報のPydanticモデル
             - 認証失敗時: None
-    
+
     Raises:
         Exception: データベースアクセス時のエラー
-    
+
     使用例:
         user = await get_user_by_id_and_password(session, "user123", "password")
         if user:
@@ -32,18 +64,18 @@ async def get_user_by_id_and_password(session: AsyncSession, user_id: str, passw
     """
 
     try:
-        # SQL SELECT文を構築してユーザーを検索
-        # WHERE句で user_id AND password の両方が一致するレコードを検索
-        result = await session.execute(
-            select(UserModel).where(UserModel.user_id == user_id, UserModel.password == password)
-        )
+        # 主キーのuser_idのみで検索し、パスワードはハッシュと照合する
+        # （平文パスワードをWHERE句に含めない）
+        result = await session.execute(_SELECT_USER_BY_ID, {"user_id": user_id})
         # scalar_one_or_none(): 結果が1件の場合はそのオブジェクト、0件の場合はNoneを返す
         user = result.scalar_one_or_none()
+        if not user or not verify_password(password, user.password):
+            return None
         # SQLAlchemyモデルをPydanticスキーマに変換
-        return UserSchema.model_validate(user) if user else None
-    except Exception as e:
+        return _user_from_orm(user)
+    except Exception:
         # データベースエラーをキャッチして安全に処理
-        print(f"Error occurred while fetching user: {e}")
+        logger.exception("Error occurred while fetching user")
         return None
 
 async def get_user_by_id(session:AsyncSession, user_id: str) -> UserSchema | None:
@@ -65,15 +97,13 @@ async def get_user_by_id(session:AsyncSession, user_id: str) -> UserSchema | Non
     """
     try:
         # ユーザーIDのみでユーザーを検索（パスワード認証なし）
-        result = await session.execute(
-            select(UserModel).where(UserModel.user_id == user_id)
-        )
+        result = await session.execute(_SELECT_USER_BY_ID, {"user_id": user_id})
         user = result.scalar_one_or_none()
         # SQLAlchemyモデルをPydanticスキーマに変換
-        return UserSchema.model_validate(user) if user else None
-    except Exception as e:
+        return _user_from_orm(user) if user else None
+    except Exception:
         # データベースエラーの安全な処理
-        print(f"Error occurred while fetching user: {e}")
+        logger.exception("Error occurred while fetching user")
         return None
     
 async def get_users(session: AsyncSession) -> list[UserSchema] | None:
@@ -107,13 +137,12 @@ async def get_users(session: AsyncSession) -> list[UserSchema] | None:
     try:
         # SQL SELECT文を構築してユーザーを検索
         # WHERE句で user_id AND password の両方が一致するレコードを検索
-        result = await session.execute(select(UserModel))
-        users = result.scalars().all()
-        # scalar_one_or_none(): 結果が1件の場合はそのオブジェクト、0件の場合はNoneを返す
-        return [UserSchema.model_validate(user) for user in users]
-    except Exception as e:
+        result = await session.execute(_SELECT_ALL_USERS)
+        # mappings(): 各行をカラム名→値の辞書として受け取る
+        return [UserSchema.model_construct(**row) for row in result.mappings()]
+    except Exception:
         # データベースエラーをキャッチして安全に処理
-        print(f"Error occurred while fetching user: {e}")
+        logger.exception("Error occurred while fetching user")
         return None
     
 async def create_user(session: AsyncSession, user_data: UserSchema) -> UserSchema | None:
@@ -132,34 +161,41 @@ async def create_user(session: AsyncSession, user_data: UserSchema) -> UserSchem
         1. PydanticモデルをSQLAlchemyモデルに変換
         2. セッションに追加
         3. データベースにコミット（永続化）
-        4. 最新データでオブジェクトを更新
-    
+
     Note:
         - model_dump(): PydanticモデルをPython辞書に変換
         - session.add(): セッションにオブジェクトを追加（まだDBには保存されない）
         - session.commit(): 変更をデータベースに永続化
-        - session.refresh(): DBから最新データを取得してオブジェクトを更新
+        - expire_on_commit=Falseのためcommit後も属性は有効（refresh不要）
     """
     try:
+        # user_idの重複はexists()のスカラーサブクエリで軽量に確認する
+        # （行全体を取得せず、重複時のIntegrityError→rollback経路も回避）
+        duplicate = await session.scalar(
+            select(exists().where(UserModel.user_id == user_data.user_id))
+        )
+        if duplicate:
+            return None
+
+        # パスワードは平文のまま保存せず、bcryptでハッシュ化してから登録する
+        data = user_data.model_dump()
+        data["password"] = hash_password(data["password"])
+
         # Pydanticモデルの辞書データを使ってSQLAlchemyモデルのインスタンスを作成
-        new_user = UserModel(**user_data.model_dump())
+        new_user = UserModel(**data)
         
         # セッションにオブジェクトを追加（まだDBには保存されない）
         session.add(new_user)
         
         # データベースに変更をコミット（実際にDBに保存）
         await session.commit()
-        
-        # DBから最新のデータを取得してオブジェクトを更新
-        # これにより、auto_incrementのIDなどが反映される
-        await session.refresh(new_user)
-        
+
         # SQLAlchemyモデルをPydanticスキーマに変換
-        return UserSchema.model_validate(new_user)
-    except Exception as e:
+        return _user_from_orm(new_user)
+    except Exception:
         # エラー時にロールバックを実行
         await session.rollback()
-        print(f"Error occurred while creating user: {e}")
+        logger.exception("Error occurred while creating user")
         return None
 
 async def update_user(
@@ -180,45 +216,42 @@ async def update_user(
             - 更新失敗時: None（ユーザーが見つからない、またはエラー）
     
     処理の流れ:
-        1. 更新対象のユーザーをIDで検索
-        2. ユーザーが存在する場合、各属性を更新
+        1. UPDATE ... RETURNING文を1回発行して更新と更新後の行取得をまとめる
+        2. 該当行がなければNoneを返す
         3. 変更をデータベースにコミット
-        4. 最新データでオブジェクトを更新
-    
+
     Note:
-        - setattr(): オブジェクトの属性を動的に設定
-        - この方法により、Pydanticモデルの全フィールドを一括更新
+        - SELECT→setattr→commit→refreshの方式はDBへの往復が4回になるため、
+          RETURNING句付きのUPDATE文で1往復にまとめています
     """
     try:
-        # 既存のユーザーを検索
-        result = await session.execute(
-            select(UserModel).where(UserModel.user_id == user_id)
+        # パスワードは平文のまま保存せず、bcryptでハッシュ化してから更新する
+        # （GET /users/{user_id}の結果をそのままPUTするクライアントが
+        # ハッシュ済みの値を送ってくるケースでは二重ハッシュ化しない）
+        data = user_data.model_dump()
+        if not is_password_hash(data["password"]):
+            data["password"] = hash_password(data["password"])
+
+        # UPDATE ... RETURNINGで更新と更新後の行取得を1文にまとめる
+        stmt = (
+            update(UserModel)
+            .where(UserModel.user_id == user_id)
+            .values(**data)
+            .returning(UserModel)
         )
+        result = await session.execute(stmt)
         user = result.scalar_one_or_none()
-        
-        if user:
-            # ユーザーが見つかった場合、各フィールドを更新
-            # model_dump()でPydanticモデルを辞書に変換し、各項目を設定
-            for key, value in user_data.model_dump().items():
-                # setattr(オブジェクト, 属性名, 値)で動的に属性を設定
-                setattr(user, key, value)
-            
-            # 変更をデータベースに保存
-            await session.commit()
-            
-            # DBから最新データを取得して反映
-            await session.refresh(user)
-            
-            # SQLAlchemyモデルをPydanticスキーマに変換
-            return UserSchema.model_validate(user)
-        
-        # ユーザーが見つからない場合
-        return None
-        
-    except Exception as e:
+
+        # 変更をデータベースに保存
+        await session.commit()
+
+        # SQLAlchemyモデルをPydanticスキーマに変換（該当行がなければNone）
+        return _user_from_orm(user) if user else None
+
+    except Exception:
         # エラー時にロールバックを実行
         await session.rollback()
-        print(f"Error occurred while updating user: {e}")
+        logger.exception("Error occurred while updating user")
         return None
 
 async def delete_user(session: AsyncSession, user_id: str) -> bool:
@@ -235,39 +268,33 @@ async def delete_user(session: AsyncSession, user_id: str) -> bool:
             - False: 削除失敗（ユーザーが見つからない、またはエラー）
     
     処理の流れ:
-        1. 削除対象のユーザーをIDで検索
-        2. ユーザーが存在する場合、セッションから削除
+        1. DELETE文を1回発行して削除を実行
+        2. rowcountで削除された行数を確認
         3. 変更をデータベースにコミット
-    
+
     Note:
-        - 外部キー制約によって関連するアイテム（TODO）も削除される可能性があります
-        - CASCADE設定により、このユーザーに紐づくTODOアイテムも自動削除されます
-    
+        - SELECTで取得してから削除する方式はDBへの往復が2回になるため、
+          DELETE文を直接発行して1回の往復で済ませています
+        - ON DELETE CASCADE設定により、このユーザーに紐づくタスクも
+          同時に削除されます（PRAGMA foreign_keys=ONが前提）
+
     Warning:
         この操作は取り消せません。重要なデータの削除前には
         必ず確認処理を実装することを推奨します。
     """
     try:
-        # 削除対象のユーザーを検索
+        # DELETE文を直接発行（該当行がなければrowcountが0になる）
         result = await session.execute(
-            select(UserModel).where(UserModel.user_id == user_id)
+            delete(UserModel).where(UserModel.user_id == user_id)
         )
-        user = result.scalar_one_or_none()
-        
-        if user:
-            # ユーザーが見つかった場合、セッションから削除
-            await session.delete(user)
-            
-            # 変更をデータベースに保存（実際に削除実行）
-            await session.commit()
-            
-            return True  # 削除成功
-        
-        # ユーザーが見つからない場合
-        return False
-        
-    except Exception as e:
+
+        # 変更をデータベースに保存（実際に削除実行）
+        await session.commit()
+
+        return result.rowcount > 0
+
+    except Exception:
         # エラー時にロールバックを実行
         await session.rollback()
-        print(f"Error occurred while deleting user: {e}")
+        logger.exception("Error occurred while deleting user")
         return False
\ No newline at end of file
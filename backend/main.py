@@ -1,11 +1,13 @@
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from routers.item import router as item_router
 from routers.user import router as user_router
 from fastapi.middleware.cors import CORSMiddleware
 from utils.exceptions import TodoAppException
 
-app = FastAPI()
+# default_response_class=ORJSONResponse: 全エンドポイントのJSONシリアライズを
+# 標準のjsonモジュールより高速なorjsonで行う
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.include_router(
     item_router
@@ -28,7 +30,15 @@ async def todo_exception_handler(request, exc: TodoAppException):
     """
     カスタム例外のハンドラー
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"success": False, "message": exc.message}
-    )
\ No newline at end of file
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # loop="uvloop": デフォルトのasyncioイベントループより高速な実装を使用
+    # http="httptools": 純Pythonのh11より高速なHTTPパーサーを使用
+    uvicorn.run("main:app", host="127.0.0.1", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
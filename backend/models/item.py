@@ -8,9 +8,15 @@ class Item(Base):
 
     item_id: int = Column(Integer, primary_key=True, autoincrement=True)
     task_name: str = Column(String(100), nullable=False)
-    user_id: str =  Column(String(20), ForeignKey('todo_user.user_id', ondelete='SET NULL'), nullable=False)
+    # index=True: user_id単位の検索（get_item_by_user_id）が全件スキャンに
+    # ならないようインデックスを作成する
+    # ondelete='CASCADE': user_idはnullable=FalseのためSET NULLは適用できず、
+    # ユーザー削除時は紐づくタスクも一緒に削除する
+    user_id: str =  Column(String(20), ForeignKey('todo_user.user_id', ondelete='CASCADE'), nullable=False, index=True)
     expire_date: datetime = Column(DateTime, nullable=False)
     finished_date: datetime = Column(DateTime, nullable=True)
 
     # リレーションシップの定義
-    user = relationship("User", back_populates="items")
+    # lazy="raise_on_sql": 暗黙の遅延ロード（N+1クエリの原因）をエラーにして、
+    # 必要な場合はクエリ側でselectinloadを明示させる
+    user = relationship("User", back_populates="items", lazy="raise_on_sql")
@@ -9,4 +9,6 @@ class User(Base):
     name: str = Column(String(40), nullable=False)
     password: str = Column(String(100), nullable=False)
     # リレーションシップの定義
-    items = relationship("Item", back_populates="user")
\ No newline at end of file
+    # lazy="raise_on_sql": 暗黙の遅延ロード（N+1クエリの原因）をエラーにして、
+    # 必要な場合はクエリ側でselectinloadを明示させる
+    items = relationship("Item", back_populates="user", lazy="raise_on_sql")
\ No newline at end of file
@@ -1,22 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from cruds.item import get_item, get_item_by_id, delete_item, update_finished_date, create_item, update_item
+from cruds.item import get_item, get_item_by_id, delete_item, update_finished_date, create_item, create_items, update_item, stream_items
 from schemas.item import Item
-from security.auth import get_current_user
+from security.auth import get_current_user_id
 from tododb import get_db_session
 from datetime import datetime
 from utils.exceptions import raise_not_found, raise_bad_request
 
 router = APIRouter(tags=["Items"], prefix="/items")
 
+# TypeAdapterの構築はスキーマ解析を伴い高コストなため、モジュール読み込み時に
+# 1回だけ作成して使い回す（一覧レスポンスをまとめてJSONバイト列に変換する）
+_ITEM_LIST_ADAPTER = TypeAdapter(list[Item])
+
 @router.get("/", response_model=list[Item] | None)
 async def read_items_endpoint(db_session: AsyncSession = Depends(get_db_session),
-                               current_user = Depends(get_current_user)):
-    return await get_item(db_session)
+                               current_user_id: str = Depends(get_current_user_id)):
+    items = await get_item(db_session)
+    # Responseを直接返すことでresponse_modelによる再バリデーションと
+    # jsonable_encoderの変換を省略し、リスト全体をpydantic-coreの
+    # Rust実装で一括シリアライズする
+    # （response_model指定はOpenAPIドキュメント用に残している）
+    return Response(content=_ITEM_LIST_ADAPTER.dump_json(items),
+                    media_type="application/json")
+
+@router.get("/stream")
+async def stream_items_endpoint(db_session: AsyncSession = Depends(get_db_session),
+                                 current_user_id: str = Depends(get_current_user_id)):
+    """
+    全タスクをNDJSON形式（1行1タスク）でストリーミング配信するエンドポイント
+
+    全件をメモリに載せる/itemsと異なり、DBから読み出した行を順次送信するため
+    件数が多くてもメモリ使用量が一定になる。
+    """
+    async def generate():
+        async for item in stream_items(db_session):
+            yield orjson.dumps(item) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/{item_id}", response_model=Item | None)
 async def read_item_endpoint(item_id: int, db_session: AsyncSession = Depends(get_db_session),
-                              current_user = Depends(get_current_user)):
+                              current_user_id: str = Depends(get_current_user_id)):
     item = await get_item_by_id(db_session, item_id)
     if not item:
         raise_not_found("Item not found")
@@ -25,7 +53,7 @@ async def read_item_endpoint(item_id: int, db_session: AsyncSession = Depends(ge
 
 @router.delete("/{item_id}", response_model=dict | None)
 async def delete_item_endpoint(item_id: int, db_session: AsyncSession = Depends(get_db_session),
-                                   current_user = Depends(get_current_user)):
+                                   current_user_id: str = Depends(get_current_user_id)):
     deleted = await delete_item(db_session, item_id)
     if not deleted:
         raise_not_found("Item not found")
@@ -33,7 +61,7 @@ async def delete_item_endpoint(item_id: int, db_session: AsyncSession = Depends(
 
 @router.put("/{item_id}/finish", response_model=Item | None)
 async def finish_item_endpoint(item_id: int, finished_date: datetime | None = None, db_session: AsyncSession = Depends(get_db_session),
-                                current_user = Depends(get_current_user)):
+                                current_user_id: str = Depends(get_current_user_id)):
     item = await update_finished_date(db_session, item_id, finished_date)
     if not item:
         raise_not_found("Item not found")
@@ -41,27 +69,44 @@ async def finish_item_endpoint(item_id: int, finished_date: datetime | None = No
 
 @router.post("/", response_model=Item | None, status_code=201)
 async def create_item_endpoint(item: Item, db_session: AsyncSession = Depends(get_db_session),
-                                current_user = Depends(get_current_user)):
+                                current_user_id: str = Depends(get_current_user_id)):
     """
     新しいタスクを作成するエンドポイント
     """
     try:
         # ユーザーIDを現在のログインユーザーに設定
-        item.user_id = current_user.user_id
+        item.user_id = current_user_id
         new_item = await create_item(db_session, item)
         return new_item
     except Exception as e:
         raise_bad_request("Failed to create item")
 
+@router.post("/batch", response_model=dict | None, status_code=201)
+async def create_items_endpoint(items: list[Item], db_session: AsyncSession = Depends(get_db_session),
+                                 current_user_id: str = Depends(get_current_user_id)):
+    """
+    複数タスクを一括作成するエンドポイント
+
+    1件ずつPOST /itemsを呼ぶとタスク数分のリクエストとトランザクションが
+    発生するため、複数行INSERT 1回で登録する。
+    """
+    # ユーザーIDを現在のログインユーザーに設定
+    for item in items:
+        item.user_id = current_user_id
+    created = await create_items(db_session, items)
+    if items and not created:
+        raise_bad_request("Failed to create items")
+    return {"detail": "Items created successfully", "count": created}
+
 @router.put("/{item_id}", response_model=Item | None)
 async def update_item_endpoint(item_id: int, item: Item, db_session: AsyncSession = Depends(get_db_session),
-                                current_user = Depends(get_current_user)):
+                                current_user_id: str = Depends(get_current_user_id)):
     """
     タスクを更新するエンドポイント
     """
     try:
         # ユーザーIDを現在のログインユーザーに設定
-        item.user_id = current_user.user_id
+        item.user_id = current_user_id
         updated_item = await update_item(db_session, item_id, item)
         if not updated_item:
            raise_not_found("Item not found")
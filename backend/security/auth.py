@@ -2,6 +2,7 @@ from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 import jwt  # ここを修正
+import time
 from datetime import datetime, timedelta
 from cruds.user import get_user_by_id
 from tododb import get_db_session
@@ -10,6 +11,14 @@ security = HTTPBearer()
 SECRET_KEY = "learning-secret-key"
 ALGORITHM = "HS256"
 
+# トークン→ユーザーのTTLキャッシュ
+# 認証付きエンドポイントはリクエストごとにJWT検証とユーザー取得のSELECTを
+# 行うため、短時間だけ結果をキャッシュしてDBへの往復を省く。
+# TTL内に削除・更新されたユーザーは最大USER_CACHE_TTL秒古い情報で通る点に注意。
+USER_CACHE_TTL = 60.0
+_USER_CACHE_MAX = 1024
+_user_cache: dict[str, tuple[float, object]] = {}
+
 def create_access_token(user_id: str):
     expire = datetime.utcnow() + timedelta(hours=24)
     payload = {
@@ -18,22 +27,56 @@ def create_access_token(user_id: str):
     }
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)  # jwt.encode
 
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> str:
+    """
+    JWTの検証のみでユーザーIDを取り出す軽量な認証依存関係
+
+    DBへの問い合わせを行わないため、認証ゲートとuser_idだけが必要な
+    エンドポイントではget_current_userより1クエリ分軽い。
+    トークンは署名検証されるため改ざんは検出できるが、発行後に削除された
+    ユーザーのトークンも有効期限内は通る点に注意（get_current_userの
+    TTLキャッシュと同種のトレードオフ）。
+    """
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("user_id")
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="無効なトークン")
+        return user_id
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="トークンの有効期限が切れています")
+    except jwt.InvalidTokenError:  # PyJWTのデコードエラーの基底クラス
+        raise HTTPException(status_code=401, detail="無効なトークン")
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db_session: AsyncSession = Depends(get_db_session)
 ):
+    # キャッシュにTTL内のエントリがあればJWT検証もDBアクセスも省略する
+    token = credentials.credentials
+    cached = _user_cache.get(token)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])  # jwt.decode
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])  # jwt.decode
         user_id = payload.get("user_id")
         if user_id is None:
             raise HTTPException(status_code=401, detail="無効なトークン")
-        
+
         user = await get_user_by_id(db_session, user_id)
         if not user:
             raise HTTPException(status_code=401, detail="ユーザーが見つかりません")
-        
+
+        # キャッシュが上限に達したらまとめて破棄する（単純なサイズ制限）
+        if len(_user_cache) >= _USER_CACHE_MAX:
+            _user_cache.clear()
+        _user_cache[token] = (time.monotonic() + USER_CACHE_TTL, user)
+
         return user
     except jwt.ExpiredSignatureError:  # jwt.ExpiredSignatureError
         raise HTTPException(status_code=401, detail="トークンの有効期限が切れています")
-    except jwt.JWTError:  # jwt.JWTError
+    except jwt.InvalidTokenError:  # PyJWTのデコードエラーの基底クラス
         raise HTTPException(status_code=401, detail="無効なトークン")
\ No newline at end of file
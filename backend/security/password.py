@@ -0,0 +1,42 @@
+import bcrypt
+
+def hash_password(password: str) -> str:
+    """
+    平文パスワードをbcryptでハッシュ化する関数
+
+    Args:
+        password (str): 平文パスワード
+
+    Returns:
+        str: ソルト付きのbcryptハッシュ（60文字）
+    """
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+def is_password_hash(value: str) -> bool:
+    """
+    値が既にbcryptハッシュ形式かどうかを判定する関数
+
+    Args:
+        value (str): 判定する文字列
+
+    Returns:
+        bool: bcryptハッシュ（$2a$/$2b$/$2y$で始まる60文字）ならTrue
+    """
+    return value.startswith(("$2a$", "$2b$", "$2y$")) and len(value) == 60
+
+def verify_password(password: str, hashed: str) -> bool:
+    """
+    平文パスワードをbcryptハッシュと照合する関数
+
+    Args:
+        password (str): 照合する平文パスワード
+        hashed (str): DBに保存されたbcryptハッシュ
+
+    Returns:
+        bool: 一致すればTrue、不一致や不正なハッシュ形式ならFalse
+    """
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        # ハッシュ形式が不正な場合（ハッシュ化前の古いデータなど）
+        return False
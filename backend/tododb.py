@@ -1,17 +1,48 @@
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
 DATABASE_URL = 'sqlite+aiosqlite:///' + os.path.join(os.path.dirname(__file__), 'tododb.sqlite')
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# コネクションプールを明示的に設定する
+# - echo: SQLログは全クエリの文字列整形と出力を伴い高コストなため通常は無効。
+#   デバッグ時は環境変数 TODOAPP_SQL_ECHO=1 で有効化する
+# - pool_size: 常時保持する接続数（リクエストごとの接続確立コストを回避）
+# - max_overflow: ピーク時に追加で許可する接続数
+# - pool_timeout: プールが枯渇した場合に接続を待つ秒数
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=os.environ.get("TODOAPP_SQL_ECHO") == "1",
+    pool_size=5,
+    max_overflow=10,
+    pool_timeout=30,
+)
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    接続ごとにSQLiteのPRAGMAを設定するフック
+
+    - journal_mode=WAL: 読み取りと書き込みが互いをブロックしなくなる
+    - busy_timeout: ロック競合時に即エラーにせず指定ミリ秒まで待つ
+    - synchronous=NORMAL: WALと組み合わせて安全性を保ちつつfsync回数を削減
+    - foreign_keys=ON: SQLiteはデフォルトで外部キー制約を無視するため、
+      モデルで宣言したON DELETE動作を有効にする
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
 
-async_session = sessionmaker(
+# async_sessionmaker: 非同期セッション専用のファクトリ（class_指定が不要）
+async_session = async_sessionmaker(
     engine,
     expire_on_commit=False,
-    class_=AsyncSession
 )
 
 async def get_db_session():